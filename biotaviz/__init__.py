@@ -0,0 +1,10 @@
+"""
+biotaviz
+--------
+.. module:: biotaviz
+  :synopsis: BiotaViz conversion and sankey preparation tools
+
+The tools are run as subcommands of the ``biotaviz`` command, see biotaviz.cli.
+Nothing is imported here so starting a single command stays cheap.
+"""
+__version__ = '0.1.0'
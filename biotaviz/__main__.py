@@ -0,0 +1,5 @@
+import sys
+
+from biotaviz.cli import main
+
+sys.exit(main())
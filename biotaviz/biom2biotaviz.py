@@ -0,0 +1,279 @@
+# todoc
+"""
+biom2biotaviz
+-----------
+
+.. module:: biotaviz.biom2biotaviz
+  :synopsis: Convert biom file to BiotaViz-style txt file
+
+Script generates a BiotaViz-style tab-delimited txt file from a biom file (v1).
+Output is written to <infile>.txt and <infile>.biotaviz.txt
+
+Typical run::
+
+    biotaviz biom2biotaviz -i some_biom_file.biom1 -o BiotaViz.txt
+
+Very wide tables (many samples) can be split over several worker processes::
+
+    biotaviz biom2biotaviz -i some_biom_file.biom1 -o BiotaViz.txt -p 8
+
+Per-node (prevalence, mean, max relative abundance) and per-rank (Shannon, richness)
+summaries can be written alongside the output with -s and -d, see biotaviz.summary.
+
+Changes:
+28/06/2020: String formating update, added 'd' to label_replace dictionary
+19/10/2026: Added -p option for processing sample columns in parallel shards
+19/10/2026: Added -s and -d options for node summary and rank diversity sidecar files
+19/10/2026: Moved into the biotaviz package, run as "biotaviz biom2biotaviz"
+
+Author: Jos Boekhorst
+"""
+# Import required functions
+import sys
+import os
+from argparse import ArgumentParser
+
+from biotaviz.shards import map_shards, shard_state, split_columns
+
+
+def usage():
+    sys.stderr.write(f"Use: {sys.argv[0]} <infile>\n")
+
+
+def read_txt(filename):
+    infile = open(filename, 'r')
+    text = infile.read().rstrip('\n')
+    infile.close()
+    return text
+
+
+def remove_empty_terminals(taxon):
+    """remove terminal taxonomy bits that are empty"""
+    new_taxon = []
+    taxon_split = taxon.split('; ')
+    for element in taxon_split:
+        if element.split('__')[-1] != "":
+            new_taxon.append(element)
+        else:
+            break
+    return '; '.join(new_taxon)
+
+
+def clean_taxon(taxon):
+    """turn the taxonomy column of an OTU table line into a rooted taxon"""
+    if taxon == 'Unassigned':  # happens in not-quite-filtered-enough qiime2 data, for example the test case
+        taxon = 'd__Unassigned'
+    taxon = 'r__Root; ' + taxon
+    taxon = taxon.replace("NA;", "k__;")  # NG_Tax weirdness
+    return remove_empty_terminals(taxon)
+
+
+def get_new_number(taxon_to_trace, trace):
+    """get a new number for a taxon trace"""
+    parent = trace[:-1]
+    # get current highest child
+    current_children = [0]
+    for element in taxon_to_trace.keys():
+        element_parent = element[:-1]
+        if element_parent == parent:
+            current_children.append(int(taxon_to_trace[element].rstrip('.').split('.')[-1]))
+    return max(current_children) + 1
+
+
+def traces_from_taxonomy(collapsed):
+    taxon_to_trace = {tuple(['r__Root']): '1.'}
+    for taxon in collapsed:
+        taxon_gs = taxon.split('; ')
+        full_name = []
+        for taxon_g in taxon_gs:
+            label = taxon_g
+            full_name.append(label)
+
+        # Now get a code. Parents need to be inferred.
+        for i in range(1, len(full_name)):
+            tmp = full_name[:i + 1]
+            parent = full_name[:i]
+            if not tuple(tmp) in taxon_to_trace:
+                new_nr = get_new_number(taxon_to_trace, tuple(tmp))
+                new_trace = f"{taxon_to_trace[tuple(parent)]}{str(new_nr)}."
+                taxon_to_trace[tuple(tmp)] = new_trace
+    return taxon_to_trace
+
+
+def inverse_dict(input_dict):
+    # generate new dictionary by swapping key and value
+    new_dict = {}
+    for element in input_dict.keys():
+        element_value = input_dict[element]
+        new_dict[element_value] = element
+    return new_dict
+
+
+def count_shard(columns):
+    """collapse, infer internal counts and format the output for one block of sample columns
+
+    Uses the OTU table lines, their taxa, the ordered output nodes and (optionally) the
+    node ranks in shard_state. Returns one tab-joined string per output node, in the
+    order of shard_state['nodes'], and the summary statistics of the block (None if
+    no ranks were given to the worker).
+    """
+    width = len(columns)
+    collapsed = {}
+    for line, taxon in zip(shard_state['lines'], shard_state['taxa']):
+        lineg = line.split('\t')
+        if taxon not in collapsed:
+            collapsed[taxon] = [0.0] * width
+        taxon_counts = collapsed[taxon]
+        for i, column in enumerate(columns):
+            taxon_counts[i] += float(lineg[column])
+
+    counts = {}
+    for taxon, taxon_counts in collapsed.items():
+        taxon_g = taxon.split('; ')
+        for i in range(len(taxon_g)):
+            taxon_sub = tuple(taxon_g[:i + 1])
+            if taxon_sub not in counts:
+                counts[taxon_sub] = [0.0] * width
+            node_counts = counts[taxon_sub]
+            for j, count in enumerate(taxon_counts):
+                node_counts[j] += count
+
+    rows = [counts[node] for node in shard_state['nodes']]
+    statistics = None
+    if shard_state['ranks'] is not None:
+        statistics = count_statistics(rows, shard_state['ranks'])
+    return ["\t".join(["%f" % count for count in row]) for row in rows], statistics
+
+
+def count_statistics(rows, ranks):
+    """summary statistics of a block of count rows, the first row being the root"""
+    from biotaviz.summary import block_statistics, np, relative_abundance
+
+    counts = np.array(rows, dtype=float)
+    return block_statistics(relative_abundance(counts, counts[0]), ranks)
+
+
+def sharded_counts(filename, processes, summary=False):
+    """read an OTU table and compute the BiotaViz count columns, in parallel sample shards
+
+    The taxonomy and trace assignment is done once; every worker then handles a block
+    of (sorted) sample columns and the blocks are stitched back together column-wise.
+    With one process there is a single block, handled in this process.
+    Returns the sorted samples, the sorted traces, trace_to_taxon, per trace the
+    tab-joined formatted counts and (if summary is set) the summary statistics.
+    """
+    lines = read_txt(filename).split('\n')
+    samples = lines[1].split('\t')[1:-1]
+    lines = lines[2:]
+    taxa = [clean_taxon(line[line.rfind('\t') + 1:]) for line in lines]
+
+    taxon_to_trace = traces_from_taxonomy(dict.fromkeys(taxa))
+    trace_to_taxon = inverse_dict(taxon_to_trace)
+    traces = list(trace_to_taxon.keys())
+    traces.sort()
+    nodes = [trace_to_taxon[trace] for trace in traces]
+    ranks = None
+    if summary:
+        from biotaviz.summary import node_ranks
+        ranks = node_ranks([nice_label(node) for node in nodes])
+
+    # first column is the OTU id, so sample i is in column i + 1
+    columns = sorted(range(1, len(samples) + 1), key=lambda column: samples[column - 1])
+    blocks = split_columns(columns, processes)
+    shards = map_shards(count_shard, blocks, {'lines': lines, 'taxa': taxa, 'nodes': nodes, 'ranks': ranks})
+
+    rows = ["\t".join(fragments) for fragments in zip(*[shard[0] for shard in shards])]
+    samples = [samples[column - 1] for column in columns]
+    statistics = None
+    if summary:
+        from biotaviz.summary import combine_statistics
+        statistics = combine_statistics([shard[1] for shard in shards])
+    return samples, traces, trace_to_taxon, dict(zip(traces, rows)), statistics
+
+
+def nice_label(taxon):
+    """human-readable label for the last element of a taxon tuple"""
+    nice_taxon = taxon[-1].split('__')
+    if nice_taxon[0] == 'Unknown':
+        return "Unknown"
+    return label_replace[nice_taxon[0]] + " - " + nice_taxon[-1]
+
+
+# settings
+description = 'Converts biom file or biom-style OTU table to biotaviz file. Output is printed to std, redirect to file with "biom convert -i infile.biom  > BiotaViz.txt". You may also be interested in JOS_clean_biom_txt.py.'
+
+label_replace = {'r': 'no',
+                 'k': 'domain',
+                 'd': 'domain',
+                 'p': 'phylum',
+                 'c': 'class',
+                 'o': 'order',
+                 'f': 'family',
+                 'g': 'genus',
+                 's': 'species',
+                 'sh': 'specieshypothesis',
+                 't': 'variant'}
+
+
+def build_parser(prog=None):
+    parser = ArgumentParser(prog=prog, description=description, add_help=True)
+    parser.add_argument('-i', dest='infile', help='name of input file', required=True)
+    parser.add_argument('-o', dest='outfile', help='name of output file', default="stdout")
+    parser.add_argument('-t', dest='isText', action='store_true', help="input is OTU table, not biom")
+    parser.add_argument('-p', dest='processes', type=int, default=1,
+                        help="number of worker processes; above 1 the sample columns are split into shards")
+    parser.add_argument('-s', dest='summary', default='',
+                        help="also write prevalence, mean and max relative abundance per node to this file")
+    parser.add_argument('-d', dest='diversity', default='',
+                        help="also write Shannon diversity and richness per rank and sample to this file")
+    return parser
+
+
+def run(argv=None, prog=None):
+    options = vars(build_parser(prog).parse_args(argv))
+    infile = options['infile']
+
+    if options['isText'] is not True:
+        outfile = infile + '.txt'
+        if os.path.isfile(outfile):
+            sys.stderr.write(
+                "Outfile {outfile} exists, aborting. Use -t if you would like to use this table as input.\n".format(
+                    outfile=outfile))
+            sys.exit()
+
+        # generate tab-delimited OTU matrix with taxonomy in final column
+        # alterantive would be the Python biom functions
+        command = f"biom convert -i {infile} -o {infile}.txt --to-tsv --header-key taxonomy"
+        sys.stderr.write("Executing: {command}\n".format(command=command))
+        os.system(command)
+
+        infile = infile + '.txt'
+
+    # read the tab-delimited data & collapse
+    sys.stderr.write("Reading input data\n")
+
+    summary = options['summary'] != '' or options['diversity'] != ''
+    samples, traces, trace_to_taxon, rows, statistics = sharded_counts(infile, options['processes'], summary)
+
+    # printing the results
+    sys.stderr.write("Printing output\n")
+
+    outtext = [("#class\tclass id\t" + "\t".join(samples))]
+
+    for trace in traces:
+        outtext.append("\t".join([trace, nice_label(trace_to_taxon[trace]), rows[trace]]))
+
+    if summary:
+        from biotaviz.summary import write_node_summary, write_rank_diversity
+        if options['summary'] != '':
+            write_node_summary(options['summary'], traces,
+                               [nice_label(trace_to_taxon[trace]) for trace in traces], statistics)
+        if options['diversity'] != '':
+            write_rank_diversity(options['diversity'], samples, statistics)
+
+    if options['outfile'] == 'stdout':
+        print('\n'.join(outtext))
+    else:
+        output = open(options['outfile'], 'w')
+        output.write('\n'.join(outtext))
+        output.close()
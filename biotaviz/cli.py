@@ -0,0 +1,126 @@
+"""
+cli
+---
+.. module:: biotaviz.cli
+  :synopsis: Single entry point for all BiotaViz tools
+
+All tools are subcommands of one ``biotaviz`` command. A tool's module (and its
+dependencies) is only imported when that subcommand is run, so a call only pays
+for the tool it uses.
+
+Typical run::
+
+    biotaviz biom2biotaviz -i some_biom_file.biom1 -o BiotaViz.txt
+    biotaviz counts-to-abundance -i BiotaViz.txt -o BiotaViz_relative.txt
+
+Many invocations can be run in one process with a job file, one command per line
+(the subcommand and its options, quoted like in a shell; empty lines and lines
+starting with '#' are ignored)::
+
+    biotaviz batch jobs.txt
+
+Run ``biotaviz <command> -h`` for the options of a command.
+"""
+import importlib
+import shlex
+import sys
+import traceback
+from argparse import ArgumentParser
+
+# subcommand: (module, description)
+commands = {
+    'biom2biotaviz': ('biotaviz.biom2biotaviz', 'convert biom file or biom-style OTU table to biotaviz file'),
+    'clean-biom-txt': ('biotaviz.clean_biom_txt', 'add last-known level to biom taxon trace'),
+    'counts-to-abundance': ('biotaviz.counts_to_abundance', 'convert raw-count biotaviz file to relative abundance'),
+    'sankey-file-prep': ('biotaviz.sankey_file_prep', 'create the .csv files for the sankey diagram R scripts'),
+    'batch': ('biotaviz.cli', 'run the commands in a job file in one process'),
+}
+
+description = 'BiotaViz tools. Commands:\n' + '\n'.join(
+    [f"  {command:<22}{commands[command][1]}" for command in commands])
+
+
+def run_command(command, argv):
+    """run a subcommand with its own arguments, returns its exit status
+
+    A missing optional dependency (ImportError) is reported and gives exit status 1.
+    """
+    if command not in commands:
+        sys.stderr.write(f'Unknown command "{command}", use one of: {", ".join(commands)}\n')
+        return 2
+    module = importlib.import_module(commands[command][0])
+    try:
+        module.run(argv, prog=f"biotaviz {command}")
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        sys.stderr.write(f"{e.code}\n")
+        return 1
+    except ImportError as e:
+        sys.stderr.write(f"{e}\n")
+        return 1
+    return 0
+
+
+def build_parser(prog=None):
+    parser = ArgumentParser(prog=prog, description='Run the commands in a job file in one process, one command '
+                                                   'per line. Lines are split like in a shell.', add_help=True)
+    parser.add_argument('jobfile', help='name of job file, "-" for stdin')
+    parser.add_argument('-k', dest='keep_going', action='store_true',
+                        help='continue with the next job after a failed job')
+    return parser
+
+
+def run_job(number, line):
+    """run one line of a job file, returns its exit status or None if the line holds no job"""
+    try:
+        job = shlex.split(line, comments=True)
+    except ValueError as e:
+        sys.stderr.write(f"Line {number}: can not parse job ({e})\n")
+        return 2
+    if job and job[0] == 'biotaviz':
+        job = job[1:]
+    if not job:
+        return None
+    if job[0] == 'batch':
+        sys.stderr.write(f"Line {number}: batch jobs can not be nested\n")
+        return 2
+    try:
+        return run_command(job[0], job[1:])
+    except Exception:
+        traceback.print_exc()
+        return 1
+
+
+def run(argv=None, prog=None):
+    """batch subcommand: run every job in the job file, stops at the first failure unless -k is given"""
+    options = vars(build_parser(prog).parse_args(argv))
+    if options['jobfile'] == '-':
+        lines = sys.stdin.read().split('\n')
+    else:
+        with open(options['jobfile'], 'r') as f:
+            lines = f.read().split('\n')
+
+    failed = 0
+    for number, line in enumerate(lines, start=1):
+        status = run_job(number, line)
+        if status is not None and status != 0:
+            failed += 1
+            sys.stderr.write(f"Line {number}: job failed with exit status {status}: {line.strip()}\n")
+            if not options['keep_going']:
+                break
+    if failed:
+        sys.exit(1)
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv or argv[0] in ('-h', '--help'):
+        sys.stdout.write(f"usage: biotaviz <command> [options]\n\n{description}\n")
+        return 0 if argv else 2
+    return run_command(argv[0], argv[1:])
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+# todoc
+
+"""
+counts_to_abundance
+---------------
+.. module:: biotaviz.counts_to_abundance
+  :synopsis: Convert raw-count BiotViz-style file to relative abundance version, new edition
+.. moduleauthor:: Jos Boekhorst
+
+Convert raw-count BiotViz-style file to relative abundance version, new edition
+
+Typical run::
+
+    biotaviz counts-to-abundance -i BiotaViz.txt -o BiotaViz_relative.txt
+
+For very wide files the sample columns can be divided over several worker processes::
+
+    biotaviz counts-to-abundance -i BiotaViz.txt -o BiotaViz_relative.txt -p 8
+
+Per-node (prevalence, mean, max relative abundance) and per-rank (Shannon, richness)
+summaries of the output can be written with -s and -d, see biotaviz.summary.
+A node summary written here can be passed to "biotaviz sankey-file-prep" with --summary.
+
+Run the command with '-h' for a list of options.
+"""
+from argparse import ArgumentParser
+import sys
+
+from biotaviz.shards import map_shards, shard_state, split_columns
+
+############
+# SETTINGS #
+############
+
+def checksZeroDivision(num1, num2):
+    if num1 == 0.0 or num2 == 0.0:
+        return 0.0
+    else:
+        return num1 / num2
+
+
+def divide_shard(columns):
+    """convert one block of sample columns to relative abundance
+
+    Uses the lines to convert, the per-column totals and (optionally) the node ranks in
+    shard_state. Returns one tab-joined string per line and the summary statistics of
+    the block (None if no ranks were given to the worker).
+    """
+    total_counts = shard_state['total_counts']
+    rows = []
+    for line in shard_state['lines']:
+        lineg = line.split('\t')
+        rows.append([checksZeroDivision(float(lineg[column]), total_counts[column]) for column in columns])
+    statistics = None
+    if shard_state['ranks'] is not None:
+        from biotaviz.summary import block_statistics
+        statistics = block_statistics(rows, shard_state['ranks'])
+    return ['\t'.join([f"{value}" for value in row]) for row in rows], statistics
+
+# note: default parameters are set in argparse object (build_parser)
+description = "Convert raw-count BiotViz-style file to relative abundance version. First non-header line must be the root (i.e., total count)!"
+
+
+def build_parser(prog=None):
+    parser = ArgumentParser(prog=prog, description=description, add_help=True)
+    parser.add_argument('-i', dest='infile', help='name of input file', required=True)
+    parser.add_argument('-o', dest='outfile', help='name of output file', default='', required=False)
+    parser.add_argument('-r', dest='root_name', help='taxon to take as root (i.e., set to 1)', default='', required=False)
+    parser.add_argument('-p', dest='processes', type=int, default=1,
+                        help='number of worker processes; above 1 the sample columns are split into shards')
+    parser.add_argument('-s', dest='summary', default='', required=False,
+                        help='also write prevalence, mean and max relative abundance per node to this file')
+    parser.add_argument('-d', dest='diversity', default='', required=False,
+                        help='also write Shannon diversity and richness per rank and sample to this file')
+    return parser
+
+
+# main program
+def run(argv=None, prog=None):
+    options = vars(build_parser(prog).parse_args(argv))
+
+    if options['outfile'] == "":
+        options['outfile'] = options['infile'].replace('.txt', '_relative.txt')
+    summary = options['summary'] != '' or options['diversity'] != ''
+    if summary:
+        # import (and so check for numpy) before anything is written
+        from biotaviz.summary import node_ranks
+
+    with open(options['infile'], 'r') as f:
+        lines = f.read().rstrip().split('\n')
+
+    with open(options['outfile'], 'w') as f:
+        f.write(lines[0] + '\n')
+        if options['root_name'] != "":
+            found = 0
+            for line in lines:
+                lineg = line.split('\t')
+                if lineg[1] == options['root_name']:
+                    root_trace = lineg[0]
+                    total_counts = [float(element) for element in lineg[2:]]
+                    found = 1
+                    break
+            if found == 0:
+                sys.stderr.write('Could not find specified root name "' + options['root_name'] + '"\n')
+                sys.exit(1)
+        else:
+            total_counts = [float(element) for element in lines[1].split('\t')[2:]]
+        keep = []
+        for line in lines[1:]:
+            lineg = line.split('\t')
+            if options['root_name'] != "":
+                if lineg[0][:len(root_trace)] != root_trace:
+                    skip = 1
+                else:
+                    skip = 0
+            else:
+                skip = 0
+            if skip == 0:
+                keep.append(line)
+
+        # first two columns are trace and label; pad the totals so they can be indexed by column
+        total_counts = [0.0, 0.0] + total_counts
+        ranks = None
+        if summary:
+            ranks = node_ranks([line.split('\t', 2)[1] for line in keep])
+        blocks = split_columns(list(range(2, len(total_counts))), options['processes'])
+        shards = map_shards(divide_shard, blocks, {'lines': keep, 'total_counts': total_counts, 'ranks': ranks})
+        for line, fragments in zip(keep, zip(*[shard[0] for shard in shards])):
+            lineg = line.split('\t', 2)
+            f.write('\t'.join([lineg[0], lineg[1]] + list(fragments)) + '\n')
+
+    if ranks is not None:
+        from biotaviz.summary import combine_statistics, write_node_summary, write_rank_diversity
+        statistics = combine_statistics([shard[1] for shard in shards])
+        if options['summary'] != '':
+            write_node_summary(options['summary'], [line.split('\t', 1)[0] for line in keep],
+                               [line.split('\t', 2)[1] for line in keep], statistics)
+        if options['diversity'] != '':
+            write_rank_diversity(options['diversity'], lines[0].split('\t')[2:], statistics)
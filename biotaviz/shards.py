@@ -0,0 +1,51 @@
+"""
+shards
+------
+.. module:: biotaviz.shards
+  :synopsis: Process blocks of sample columns in parallel worker processes
+
+Wide BiotaViz tables are processed per block (shard) of sample columns. The data
+shared by all blocks is handed to every worker once, in shard_state; the worker
+function then only receives the column indices of its block.
+"""
+
+# state shared by all shard workers, set once per worker process by init_shard_worker
+shard_state = {}
+
+
+def split_columns(columns, shards):
+    """split a list of column indices into (at most) shards contiguous blocks of near-equal size"""
+    shards = max(1, min(shards, len(columns)))
+    size, extra = divmod(len(columns), shards)
+    blocks = []
+    start = 0
+    for i in range(shards):
+        end = start + size + (1 if i < extra else 0)
+        blocks.append(columns[start:end])
+        start = end
+    return blocks
+
+
+def init_shard_worker(state):
+    """store the data shared by all blocks in the worker"""
+    shard_state.clear()
+    shard_state.update(state)
+
+
+def map_shards(function, blocks, state):
+    """apply function to every block of columns, returns the results in block order
+
+    With more than one block every block is handled by its own worker process,
+    otherwise the block is handled in this process. The shared state is not kept
+    in this process afterwards.
+    """
+    if len(blocks) > 1:
+        from multiprocessing import Pool
+
+        with Pool(len(blocks), initializer=init_shard_worker, initargs=(state,)) as pool:
+            return pool.map(function, blocks)
+    init_shard_worker(state)
+    try:
+        return [function(block) for block in blocks]
+    finally:
+        shard_state.clear()
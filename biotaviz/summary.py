@@ -0,0 +1,83 @@
+"""
+summary
+-------
+.. module:: biotaviz.summary
+  :synopsis: Per-node and per-rank summary statistics for BiotaViz tables
+
+Vectorized summary statistics over the (nodes x samples) matrix held by
+biotaviz.biom2biotaviz and biotaviz.counts_to_abundance, written as sidecar files
+next to the BiotaViz output:
+
+* node summary: prevalence (fraction of samples in which the node is present),
+  mean and maximum relative abundance per node
+* rank diversity: Shannon diversity and richness per taxonomic rank and sample
+
+The per-sample statistics are computed per block of sample columns (so they can
+be computed inside the shard workers); the per-node reductions are done once over
+the stitched blocks, so the result does not depend on how the columns were split.
+
+Requires numpy, install with "pip install biotaviz[summary]".
+"""
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError('Summary files (-s, -d) require numpy, install it with "pip install biotaviz[summary]"') from e
+
+
+def relative_abundance(counts, totals):
+    """divide every column by its total, columns with a total of 0 become 0"""
+    return np.divide(counts, totals, out=np.zeros_like(counts), where=totals != 0)
+
+
+def node_ranks(labels):
+    """rank of every node, taken from its BiotaViz label (e.g. 'phylum - Firmicutes')"""
+    return [label.split(' - ')[0] for label in labels]
+
+
+def block_statistics(values, ranks):
+    """per-sample statistics for one block of sample columns of a relative abundance matrix
+
+    The block values are kept so the per-node reductions can be done over all columns at once.
+    """
+    values = np.asarray(values, dtype=float)
+    ranks = np.array(ranks)
+    diversity = {}
+    for rank in dict.fromkeys(ranks.tolist()):
+        rank_values = values[ranks == rank]
+        rank_totals = rank_values.sum(axis=0)
+        proportions = relative_abundance(rank_values, rank_totals)
+        logs = np.log(proportions, out=np.zeros_like(proportions), where=proportions > 0)
+        diversity[rank] = (0.0 - (proportions * logs).sum(axis=0), (rank_values > 0).sum(axis=0))
+    return {'values': values, 'diversity': diversity}
+
+
+def combine_statistics(blocks):
+    """stitch consecutive column blocks together and reduce the values per node"""
+    values = np.concatenate([block['values'] for block in blocks], axis=1)
+    divisor = max(values.shape[1], 1)
+    diversity = {}
+    for rank in blocks[0]['diversity']:
+        diversity[rank] = (np.concatenate([block['diversity'][rank][0] for block in blocks]),
+                           np.concatenate([block['diversity'][rank][1] for block in blocks]))
+    return {'prevalence': (values > 0).sum(axis=1) / divisor,
+            'mean': values.sum(axis=1) / divisor,
+            'max': values.max(axis=1, initial=0.0),
+            'diversity': diversity}
+
+
+def write_node_summary(filename, traces, labels, statistics):
+    """write prevalence, mean and max relative abundance per node"""
+    with open(filename, 'w') as f:
+        f.write("#class\tclass id\tprevalence\tmean\tmax\n")
+        for i, trace in enumerate(traces):
+            f.write(f"{trace}\t{labels[i]}\t{float(statistics['prevalence'][i])}\t"
+                    f"{float(statistics['mean'][i])}\t{float(statistics['max'][i])}\n")
+
+
+def write_rank_diversity(filename, samples, statistics):
+    """write Shannon diversity and richness per rank and sample"""
+    with open(filename, 'w') as f:
+        f.write("#rank\tmetric\t" + "\t".join(samples) + "\n")
+        for rank, (shannon, richness) in statistics['diversity'].items():
+            f.write(f"{rank}\tshannon\t" + "\t".join([f"{value:f}" for value in shannon]) + "\n")
+            f.write(f"{rank}\trichness\t" + "\t".join([f"{int(value)}" for value in richness]) + "\n")